@@ -23,8 +23,7 @@ class X402Handler(http.server.SimpleHTTPRequestHandler):
             print(f"[Server] Received PAYMENT-SIGNATURE: {sig_header[:20]}...")
             try:
                 # Basic decoding to verify structure
-                decoded_json = base64.b64decode(sig_header).decode()
-                payload = json.loads(decoded_json)
+                payload = json.loads(base64.b64decode(sig_header))
 
                 # Verify payload structure (mock verification)
                 if payload.get("x402Version") == 2 and "transactionHash" in payload.get(
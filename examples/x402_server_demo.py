@@ -4,23 +4,222 @@ x402 Server - Updated for Demo Testing
 This server simulates a premium content endpoint that requires payment.
 It supports both same-chain and cross-chain payments.
 
+Connections are served by an asyncio event loop, so concurrent agent probes
+don't queue behind each other. If uvloop is installed it is used as the loop
+implementation; otherwise the default asyncio loop is used. Likewise,
+PAYMENT-SIGNATURE headers are decoded with pybase64's SIMD kernels when it is
+installed and with the stdlib base64 module when it isn't. HTTP/1.1
+connections are kept alive, so a client retrying with a PAYMENT-SIGNATURE
+reuses the socket it got the 402 on.
+
 Usage:
     python x402_server_demo.py --network arc-testnet --address 0xcf6d7024cc6754fdb949f0c394903f8306d227df
 """
 import argparse
-import base64
-import http.server
+import asyncio
+import hashlib
 import json
-import socketserver
+import time
+from collections import OrderedDict
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+try:
+    from pybase64 import b64decode
+    BASE64_BACKEND = "pybase64"
+except ImportError:
+    from base64 import b64decode
+    BASE64_BACKEND = "base64"
 
 PORT = 8402
+KEEP_ALIVE_TIMEOUT = 5.0  # Seconds an idle keep-alive connection is held open
+VERIFY_CACHE_TTL = 60.0  # Seconds a verified PAYMENT-SIGNATURE is trusted without re-decoding
+VERIFY_CACHE_SIZE = 1024
+
+REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    402: "Payment Required",
+    404: "Not Found",
+    431: "Request Header Fields Too Large",
+    501: "Not Implemented",
+}
+
+# Response fragments that never change are encoded once up front
+STATUS_LINES = {code: f"HTTP/1.1 {code} {reason}\r\n".encode() for code, reason in REASONS.items()}
+JSON_HEADERS = b"Content-Type: application/json\r\n"
+PAID_HEADERS = JSON_HEADERS + b"PAYMENT-RESPONSE: authenticated\r\n"
+CONNECTION_CLOSE = b"Connection: close\r\n\r\n"
+CONNECTION_KEEP_ALIVE = b"Connection: keep-alive\r\n\r\n"
+
+# The paid body only varies by transaction hash, so everything around it is fixed
+PAID_BODY_PREFIX = json.dumps({
+    "data": "🎉 PREMIUM DATA UNLOCKED! You have access to exclusive content.",
+    "status": "paid",
+})[:-1].encode() + b', "transaction": '
+PAID_BODY_SUFFIX = b"}"
+
+# Header digest -> (verified at, inner payload), oldest first
+_VERIFIED: OrderedDict[bytes, tuple[float, dict]] = OrderedDict()
+
 
+def verify_signature(sig_header: str) -> dict | None:
+    """
+    Decode a PAYMENT-SIGNATURE header and return its inner payload.
 
-class X402Handler(http.server.SimpleHTTPRequestHandler):
+    Returns None if the payload doesn't have the expected structure and
+    raises if the header can't be decoded at all. Successful verifications
+    are cached by header digest, so a client retrying with the same
+    signature skips the decode.
+    """
+    key = hashlib.sha256(sig_header.encode()).digest()
+    now = time.monotonic()
+
+    cached = _VERIFIED.get(key)
+    if cached is not None:
+        verified_at, details = cached
+        if now - verified_at < VERIFY_CACHE_TTL:
+            _VERIFIED.move_to_end(key)
+            return details
+        del _VERIFIED[key]
+
+    payload = json.loads(b64decode(sig_header))
+
+    # Verify payload structure (mock verification)
+    if not isinstance(payload, dict) or payload.get("x402Version") != 2:
+        return None
+    details = payload.get("payload")
+    if not isinstance(details, dict) or "transactionHash" not in details:
+        return None
+
+    _VERIFIED[key] = (now, details)
+    if len(_VERIFIED) > VERIFY_CACHE_SIZE:
+        _VERIFIED.popitem(last=False)
+    return details
+
+
+class X402Handler:
     # Class variables (will be set from command line args)
     payment_address = None
     network = None
-    
+    requirements_body = b""
+
+    @classmethod
+    def configure(cls, network: str, payment_address: str):
+        """Set the payment target and pre-serialize the 402 body for it."""
+        cls.network = network
+        cls.payment_address = payment_address
+        cls.requirements_body = json.dumps({
+            "requirements": {
+                "scheme": "exact",
+                "network": network,
+                "amount": "100000",  # 0.1 USDC (6 decimals)
+                "token": "USDC",
+                "paymentAddress": payment_address,
+                "resource": f"http://localhost:{PORT}/premium",
+                "description": f"Access to premium content (Network: {network})",
+            }
+        }).encode()
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+        self.command = ""
+        self.path = ""
+        self.headers: dict[str, str] = {}
+        self.close_connection = True
+
+    async def handle(self):
+        try:
+            await self.handle_one_request()
+            while not self.close_connection:
+                await self.handle_one_request()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def handle_one_request(self):
+        self.close_connection = True
+        self.headers = {}
+        try:
+            raw = await asyncio.wait_for(
+                self.reader.readuntil(b"\r\n\r\n"), KEEP_ALIVE_TIMEOUT
+            )
+        except asyncio.LimitOverrunError:
+            self.send_error(431, "Request Header Fields Too Large")
+            await self.writer.drain()
+            return
+        except (asyncio.IncompleteReadError, asyncio.TimeoutError):
+            return
+
+        request_line, *header_lines = raw.decode("latin-1").split("\r\n")
+        parts = request_line.split()
+        if len(parts) != 3:
+            self.send_error(400, "Bad Request")
+        else:
+            self.command, self.path, version = parts
+            for line in header_lines:
+                name, sep, value = line.partition(":")
+                if sep:
+                    self.headers[name.strip().lower()] = value.strip()
+
+            connection = self.headers.get("connection", "").lower()
+            if version == "HTTP/1.1":
+                self.close_connection = connection == "close"
+            else:
+                self.close_connection = connection != "keep-alive"
+
+            if "transfer-encoding" in self.headers:
+                # Chunked bodies aren't parsed, so their data would desync the stream
+                self.close_connection = True
+                self.send_error(501, "Not Implemented")
+            elif self.command == "GET":
+                try:
+                    length = int(self.headers.get("content-length", "0") or 0)
+                except ValueError:
+                    length = -1
+
+                if length < 0:
+                    self.close_connection = True
+                    self.send_error(400, "Bad Request")
+                else:
+                    # Drain any request body so it isn't read as the next request
+                    if length:
+                        try:
+                            await asyncio.wait_for(
+                                self.reader.readexactly(length), KEEP_ALIVE_TIMEOUT
+                            )
+                        except asyncio.TimeoutError:
+                            self.close_connection = True
+                            return
+                    self.do_GET()
+            else:
+                self.close_connection = True
+                self.send_error(501, "Not Implemented")
+
+        await self.writer.drain()
+
+    def send_response(self, code: int, body: bytes, headers: bytes = b""):
+        self.writer.write(b"".join([
+            STATUS_LINES[code],
+            headers,
+            b"Content-Length: %d\r\n" % len(body),
+            CONNECTION_CLOSE if self.close_connection else CONNECTION_KEEP_ALIVE,
+            body,
+        ]))
+
+    def send_error(self, code: int, message: str):
+        body = json.dumps({"error": message}).encode()
+        self.send_response(code, body, JSON_HEADERS)
+
     def do_GET(self):
         if self.path == "/premium":
             self.handle_premium()
@@ -29,41 +228,28 @@ class X402Handler(http.server.SimpleHTTPRequestHandler):
 
     def handle_premium(self):
         # Check for V2 Header
-        sig_header = self.headers.get("PAYMENT-SIGNATURE")
+        sig_header = self.headers.get("payment-signature")
 
         if sig_header:
             print(f"[Server] Received PAYMENT-SIGNATURE: {sig_header[:30]}...")
             try:
-                # Basic decoding to verify structure
-                decoded_json = base64.b64decode(sig_header).decode()
-                payload = json.loads(decoded_json)
-
-                # Verify payload structure (mock verification)
-                if payload.get("x402Version") == 2 and "transactionHash" in payload.get(
-                    "payload", {}
-                ):
-                    tx_hash = payload['payload']['transactionHash']
-                    from_addr = payload['payload'].get('fromAddress', 'N/A')
-                    to_addr = payload['payload'].get('toAddress', 'N/A')
-                    amount = payload['payload'].get('amount', 'N/A')
-                    
+                details = verify_signature(sig_header)
+                if details is not None:
+                    tx_hash = details['transactionHash']
+                    from_addr = details.get('fromAddress', 'N/A')
+                    to_addr = details.get('toAddress', 'N/A')
+                    amount = details.get('amount', 'N/A')
+
                     print(f"[Server] ✅ Valid Payment!")
                     print(f"          Tx Hash: {tx_hash}")
                     print(f"          From: {from_addr}")
                     print(f"          To: {to_addr}")
                     print(f"          Amount: {amount} USDC")
 
-                    self.send_response(200)
-                    self.send_header("Content-Type", "application/json")
-                    self.send_header("PAYMENT-RESPONSE", "authenticated")
-                    self.end_headers()
-
-                    response = {
-                        "data": "🎉 PREMIUM DATA UNLOCKED! You have access to exclusive content.",
-                        "status": "paid",
-                        "transaction": tx_hash
-                    }
-                    self.wfile.write(json.dumps(response).encode())
+                    body = b"".join([
+                        PAID_BODY_PREFIX, json.dumps(tx_hash).encode(), PAID_BODY_SUFFIX
+                    ])
+                    self.send_response(200, body, PAID_HEADERS)
                     return
                 else:
                     print("[Server] Invalid Signature Payload")
@@ -74,48 +260,43 @@ class X402Handler(http.server.SimpleHTTPRequestHandler):
         print(f"[Server] 📬 Sending 402 Payment Required")
         print(f"          Network: {self.network}")
         print(f"          Address: {self.payment_address}")
-        
-        self.send_response(402)
-        self.send_header("Content-Type", "application/json")
-        self.end_headers()
 
-        requirements = {
-            "requirements": {
-                "scheme": "exact",
-                "network": self.network,
-                "amount": "100000",  # 0.1 USDC (6 decimals)
-                "token": "USDC",
-                "paymentAddress": self.payment_address,
-                "resource": f"http://localhost:{PORT}/premium",
-                "description": f"Access to premium content (Network: {self.network})",
-            }
-        }
-        self.wfile.write(json.dumps(requirements).encode())
+        self.send_response(402, self.requirements_body, JSON_HEADERS)
 
 
-if __name__ == "__main__":
-    parser = argparse.ArgumentParser(description="x402 Demo Server")
-    parser.add_argument("--network", required=True, help="Network (e.g., arc-testnet, base-sepolia)")
-    parser.add_argument("--address", required=True, help="Payment recipient address")
-    
-    args = parser.parse_args()
-    
-    # Set class variables
-    X402Handler.payment_address = args.address
-    X402Handler.network = args.network
+async def serve(args):
+    async def on_connect(reader, writer):
+        await X402Handler(reader, writer).handle()
 
     # Allow address reuse to avoid "Address already in use" during quick restarts
-    socketserver.TCPServer.allow_reuse_address = True
-    with socketserver.TCPServer(("", PORT), X402Handler) as httpd:
+    server = await asyncio.start_server(on_connect, "", PORT, reuse_address=True)
+    async with server:
         print("=" * 60)
         print(f"🚀 x402 Server Running on Port {PORT}")
         print("=" * 60)
         print(f"Network: {args.network}")
         print(f"Payment Address: {args.address}")
         print(f"Test URL: http://localhost:{PORT}/premium")
+        print(f"Event Loop: {'uvloop' if uvloop else 'asyncio'}")
+        print(f"Base64 Decoder: {BASE64_BACKEND}")
         print("=" * 60)
-        try:
-            httpd.serve_forever()
-        except KeyboardInterrupt:
-            print("\n\n👋 Shutting down...")
-            httpd.server_close()
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="x402 Demo Server")
+    parser.add_argument("--network", required=True, help="Network (e.g., arc-testnet, base-sepolia)")
+    parser.add_argument("--address", required=True, help="Payment recipient address")
+
+    args = parser.parse_args()
+
+    # Set class variables
+    X402Handler.configure(args.network, args.address)
+
+    if uvloop is not None:
+        uvloop.install()
+
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        print("\n\n👋 Shutting down...")
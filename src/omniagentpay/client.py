@@ -120,7 +120,8 @@ class OmniAgentPay:
 
         self._router = PaymentRouter(self._config, self._wallet_service)
         self._router.register_adapter(TransferAdapter(self._config, self._wallet_service))
-        self._router.register_adapter(X402Adapter(self._config, self._wallet_service))
+        self._x402_adapter = X402Adapter(self._config, self._wallet_service)
+        self._router.register_adapter(self._x402_adapter)
         self._router.register_adapter(GatewayAdapter(self._config, self._wallet_service))
 
         self._intent_service = PaymentIntentService(self._storage)
@@ -158,7 +159,15 @@ class OmniAgentPay:
 
     async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
         """Async context manager exit."""
-        pass
+        await self.close()
+
+    async def close(self) -> None:
+        """
+        Release HTTP connections held for x402 requests.
+
+        The client stays usable; the next x402 call opens a new connection.
+        """
+        await self._x402_adapter.close()
 
     async def get_balance(self, wallet_id: str) -> Decimal:
         """Get USDC balance for a wallet."""
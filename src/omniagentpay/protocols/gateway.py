@@ -412,21 +412,23 @@ class GatewayAdapter(ProtocolAdapter):
             
             self._logger.info(f"Attestation URL: {attestation_url}")
             
-            while attempt < max_attempts:
-                try:
-                    async with httpx.AsyncClient() as client:
+            # One client per transfer: polls reuse its keep-alive connection and
+            # it is closed on the same event loop once polling finishes
+            async with httpx.AsyncClient(timeout=self._config.http_timeout) as client:
+                while attempt < max_attempts:
+                    try:
                         response = await client.get(attestation_url, timeout=10.0)
-                        
+                    
                         if response.status_code == 200:
                             data = response.json()
                             messages = data.get("messages", [])
-                            
+                        
                             if messages and len(messages) > 0:
                                 message_data = messages[0]
                                 status = message_data.get("status")
-                                
+                            
                                 self._logger.debug(f"Attempt {attempt + 1}: status={status}")
-                                
+                            
                                 if status == "complete":
                                     attestation_signature = message_data.get("attestation")
                                     attestation_message = message_data.get("message")
@@ -438,13 +440,13 @@ class GatewayAdapter(ProtocolAdapter):
                             self._logger.debug(f"Transaction not yet indexed (attempt {attempt + 1})")
                         else:
                             self._logger.debug(f"HTTP {response.status_code}")
-                            
-                except Exception as e:
-                    self._logger.debug(f"Poll attempt {attempt + 1} failed: {e}")
+                        
+                    except Exception as e:
+                        self._logger.debug(f"Poll attempt {attempt + 1} failed: {e}")
                 
-                attempt += 1
-                if attempt < max_attempts:
-                    time.sleep(5)
+                    attempt += 1
+                    if attempt < max_attempts:
+                        time.sleep(5)
             
             if not attestation_signature or not attestation_message:
                 self._logger.warning("CCTP V2: Attestation polling timed out")
@@ -163,6 +163,8 @@ class X402Adapter(ProtocolAdapter):
         self._config = config
         self._wallet_service = wallet_service
         self._http_client = http_client
+        # Only close clients we created; an injected client belongs to the caller
+        self._owns_http_client = http_client is None
         self._logger = get_logger("x402")
 
     @property
@@ -189,6 +191,12 @@ class X402Adapter(ProtocolAdapter):
             self._http_client = httpx.AsyncClient(timeout=30.0)
         return self._http_client
 
+    async def close(self) -> None:
+        """Close the HTTP client this adapter created. The next request opens a new one."""
+        if self._owns_http_client and self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
+
     async def _request_with_402_check(
         self,
         url: str,
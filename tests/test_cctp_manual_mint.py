@@ -1,5 +1,8 @@
 
 import asyncio
+import gc
+import json
+import warnings
 from unittest.mock import MagicMock, AsyncMock, patch
 from decimal import Decimal
 import pytest
@@ -161,3 +164,73 @@ async def test_execute_cctp_forces_mint_on_arc(mock_config, mock_wallet_service)
              
              # Verify _mint_usdc was called
              adapter._mint_usdc.assert_called_once()
+
+
+@pytest.fixture
+def attestation_server():
+    """Local HTTP server returning a completed attestation over keep-alive connections."""
+    import http.server
+    import threading
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        requests = 0
+
+        def do_GET(self):
+            Handler.requests += 1
+            body = json.dumps(
+                {"messages": [{"status": "complete", "message": "0xmsg", "attestation": "0xsig"}]}
+            ).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}/attestation", Handler
+    server.shutdown()
+    server.server_close()
+
+
+def test_attestation_poll_across_event_loops_closes_connections(
+    mock_config, mock_wallet_service, attestation_server
+):
+    """Polling works under repeated asyncio.run() and leaves no sockets open."""
+    url, handler = attestation_server
+    adapter = GatewayAdapter(mock_config, mock_wallet_service)
+    adapter._mint_usdc = AsyncMock(return_value={"success": True, "tx_hash": "0xmint"})
+
+    async def transfer():
+        return await adapter._execute_cctp_transfer(
+            wallet_id="source-123",
+            source_network=Network.ETH_SEPOLIA,
+            dest_network=Network.ARC_TESTNET,
+            destination_address="0xdest",
+            amount=Decimal("10"),
+            fee_level=None,
+        )
+
+    with patch(
+        "omniagentpay.core.cctp_constants.get_iris_v2_attestation_url", return_value=url
+    ), patch("omniagentpay.protocols.gateway.time.sleep"), warnings.catch_warnings(
+        record=True
+    ) as caught:
+        warnings.simplefilter("always", ResourceWarning)
+        first = asyncio.run(transfer())
+        second = asyncio.run(transfer())
+        gc.collect()
+
+    assert not [w for w in caught if issubclass(w.category, ResourceWarning)]
+
+    assert first.success is True
+    assert second.success is True
+    assert first.metadata["mint_tx_hash"] == "0xmint"
+    assert second.metadata["mint_tx_hash"] == "0xmint"
+    # One poll per transfer: the second run didn't fall into the retry loop
+    assert handler.requests == 2
@@ -6,7 +6,7 @@ Tests the main SDK entry point with per-wallet/wallet-set guards.
 
 import os
 from decimal import Decimal
-from unittest.mock import patch
+from unittest.mock import Mock, patch
 
 import pytest
 
@@ -62,6 +62,38 @@ class TestClientInitialization:
         assert not hasattr(client, "_default_wallet_id") or client._default_wallet_id is None
 
 
+class TestClientClose:
+    """Tests for releasing HTTP connections on close."""
+
+    @pytest.mark.asyncio
+    async def test_context_manager_closes_x402_http_client(self, mock_env):
+        async with OmniAgentPay() as client:
+            http_client = await client._x402_adapter._get_http_client()
+            assert not http_client.is_closed
+        assert http_client.is_closed
+
+    @pytest.mark.asyncio
+    async def test_usable_after_close(self, mock_env):
+        async with OmniAgentPay() as client:
+            old = await client._x402_adapter._get_http_client()
+        new = await client._x402_adapter._get_http_client()
+        assert new is not old
+        assert not new.is_closed
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_close_leaves_injected_client_open(self, mock_env):
+        import httpx
+
+        from omniagentpay.protocols.x402 import X402Adapter
+
+        injected = httpx.AsyncClient()
+        adapter = X402Adapter(Mock(), Mock(), http_client=injected)
+        await adapter.close()
+        assert not injected.is_closed
+        await injected.aclose()
+
+
 class TestGuardManager:
     """Tests for GuardManager (per-wallet/wallet-set guards)."""
 